@@ -1,7 +1,9 @@
 import re
 import ast
+import os
 import sys
 import readline
+from functools import lru_cache
 
 # Attempt to import network libraries. These are not built-in, so a check is necessary.
 try:
@@ -23,12 +25,162 @@ except ImportError:
     html2text = None
     print("WARNING: 'html2text' library not found. Text decoding will not work.")
 
+# Numba is optional: it only speeds up the numeric kernels below, which run
+# as plain Python when it is missing, so no warning is needed.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Patterns for the command grammar, compiled once at import.
+_CMD_DEF_RE = re.compile(r'^(\w+)\s+(.+?)(?:\s*\[CMD=(\w+)\])?$')
+_ARG_RE = re.compile(r'\(([^)]+)\)')
+
+# A token is a run of quoted sections (quotes kept, spaces allowed inside),
+# backslash escapes and any other non-space characters.
+_TOKEN_RE = re.compile(r'(?:"(?:\\.|[^"\\])*"?|\\.|[^ "\\])+')
+_ESC_RE = re.compile(r'\\(.)')
+
+# True for script lines worth keeping: anything but blank lines and # comments
+_KEEP_LINE = re.compile(r'^\s*(?!#)\S').search
+
+# Op-codes for the numeric kernels
+_OP_ADD, _OP_SUB, _OP_MULT, _OP_DIV, _OP_AND, _OP_OR, _OP_NOR, _OP_XOR, _OP_XNOR = range(9)
+_CMP_HIGH, _CMP_LOW, _CMP_EQUAL = range(3)
+_CMP_OPS = {"HIGH": _CMP_HIGH, "LOW": _CMP_LOW, "EQUAL": _CMP_EQUAL}
+
+
+# Characters a numeric literal can start with. float() is only attempted on
+# tokens starting with one of these, so identifiers never raise ValueError.
+_NUM_PREFIX = frozenset('-+.0123456789')
+
+
+@lru_cache(maxsize=1024)
+def _parse_literal(token):
+    """Parse a quoted string, number or NULL token; returns None for anything else."""
+    if not token:
+        return None
+    c0 = token[0]
+    if c0 == '"' and token[-1] == '"':
+        return token[1:-1]
+    if c0 in _NUM_PREFIX:
+        try:
+            return float(token)
+        except ValueError:
+            pass
+    if token.upper() == 'NULL': # Treat 'NULL' as a special keyword
+        return "NULL"
+    return None
+
+
+def _as_number(value):
+    """Return value as a float, or None when it is not numeric."""
+    if type(value) is float: # parse_value and the handlers already store floats
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# The explicit signatures make Numba compile these kernels at import (or load
+# them from its cache) instead of on the first script line that needs them.
+@njit('float64(int64, float64, float64)', cache=True)
+def _dispatch_binop(op, a, b):
+    if op == _OP_ADD:
+        return a + b
+    if op == _OP_SUB:
+        return a - b
+    if op == _OP_MULT:
+        return a * b
+    if op == _OP_DIV:
+        return a / b # Caller rejects division by zero
+
+    # Logic gates treat any non-zero value as true and return 1.0 or 0.0
+    in1 = a != 0.0
+    in2 = b != 0.0
+    if op == _OP_AND:
+        result = in1 and in2
+    elif op == _OP_OR:
+        result = in1 or in2
+    elif op == _OP_NOR:
+        result = not (in1 or in2)
+    elif op == _OP_XOR:
+        result = in1 != in2
+    else: # _OP_XNOR
+        result = in1 == in2
+    return 1.0 if result else 0.0
+
+
+@njit('boolean(int64, float64, float64)', cache=True)
+def _compare(op, a, b):
+    if op == _CMP_HIGH:
+        return a > b
+    if op == _CMP_LOW:
+        return a < b
+    return a == b # _CMP_EQUAL
+
+
+# html2text settings for clean terminal output. A new HTML2Text is built per
+# document because an instance keeps appending to its output across handle() calls.
+_HTML2TEXT_OPTIONS = {
+    'ignore_links': True,
+    'ignore_images': True,
+    'ignore_tables': True,
+    'body_width': 80, # Optional: wrap lines for better readability
+}
+
+
+@lru_cache(maxsize=32)
+def _html_prettify(text):
+    """Prettify an HTML document with BeautifulSoup (cached per payload)."""
+    return str(BeautifulSoup(text, 'html.parser').prettify())
+
+
+@lru_cache(maxsize=32)
+def _html_to_text(text):
+    """Convert an HTML document to plain text with html2text (cached per payload)."""
+    h = html2text.HTML2Text()
+    for option, value in _HTML2TEXT_OPTIONS.items():
+        setattr(h, option, value)
+    return h.handle(text)
+
+
+def _script_lines(raw_lines, _keep=_KEEP_LINE):
+    """Lazily yield the stripped lines of a script, skipping blank lines and # comments."""
+    return (raw.strip() for raw in raw_lines if _keep(raw))
+
+
+@lru_cache(maxsize=256)
+def _compile_python(code):
+    """Compile a PYTHON command snippet once; loops re-running it reuse the code object."""
+    return compile(code, '<SPiD PYTHON>', 'exec')
+
 
 class SPiDInterpreter:
-    def __init__(self, script_lines=None):
+    # Names every PYTHON snippet can use besides 'variables' and 'ram'
+    _PY_ENV_TEMPLATE = {
+        'print': print,
+        'int': int,
+        'float': float,
+        'str': str,
+        'bool': bool,
+        'len': len,
+        'range': range,
+        # Add network libraries if available
+        'requests': requests,
+        'BeautifulSoup': BeautifulSoup,
+        'html2text': html2text, # NEW: Make html2text available in PYTHON env
+    }
+
+    def __init__(self, script_lines=None, verbose=False):
         self.variables = {}
         self.ram = {}
-        self.commands = self.parse_SPiD_definition()
+        self._py_env = dict(self._PY_ENV_TEMPLATE) # Globals shared by all PYTHON snippets of this interpreter
+        self.commands = self._COMMANDS # Grammar is static, parsed once at class creation
         
         self.handlers = {
             "CMP": self.handle_cmp,
@@ -50,10 +202,34 @@ class SPiDInterpreter:
             "LS_CMD": self.handle_ls,  # Added LS handler
             "NETWORK_FETCH": self.handle_network_fetch, # New network command handler
         }
+        # Resolve every command straight to its bound handler, argument count and argument parser
+        self._cmd_table = {
+            cmd: (
+                self.handlers.get(command_def['handler']),
+                command_def['arg_count'],
+                self._ARG_PARSERS.get(cmd, SPiDInterpreter._parse_generic_args),
+            )
+            for cmd, command_def in self.commands.items()
+        }
+        if script_lines is not None and not isinstance(script_lines, (list, tuple)):
+            script_lines = list(script_lines) # Any iterable works; JUMP needs random access
         self.script_lines = script_lines
+        # Parse the script once up front; run() only executes the compiled lines
+        self._program = [self._compile_line(line) for line in script_lines] if script_lines else []
         self.program_counter = 0
-
-    def parse_SPiD_definition(self):
+        self.verbose = verbose # Echo each script line before running it
+        self._branch_cache = {} # IF branch script -> compiled (fn, args) instruction
+        self._fetch_cache = {} # (client_agent, format, language, decode_type) -> prepared request settings
+        self._session = requests.Session() if requests is not None else None # Keep-alive pool shared by all fetches
+
+    @classmethod
+    def from_path(cls, path, **kwargs):
+        """Creates an interpreter for the script file at path, reading it in a single pass."""
+        with open(path, 'r', buffering=1 << 20) as f:
+            return cls(script_lines=_script_lines(f), **kwargs)
+
+    @staticmethod
+    def parse_SPiD_definition():
         SPiD_definition = """
         main.spid<
         TYPE=SPiD
@@ -116,266 +292,247 @@ class SPiDInterpreter:
                 if not line:
                     continue
 
-            match = re.match(r'^(\w+)\s+(.+?)(?:\s*\[CMD=(\w+)\])?$', line)
+            match = _CMD_DEF_RE.match(line)
             if match:
                 cmd = match.group(1).upper()
                 pattern = match.group(2).strip()
                 handler = match.group(3) if match.group(3) else None
-                commands[cmd] = {
+                commands[sys.intern(cmd)] = {
                     'pattern': pattern,
                     'handler': handler,
-                    'arg_count': len(re.findall(r'\(([^)]+)\)', pattern))
+                    'arg_count': len(_ARG_RE.findall(pattern))
                 }
         return commands
 
     def parse_value(self, token):
-        if token.startswith('"') and token.endswith('"'):
-            return token[1:-1]
-        try:
-            return float(token)
-        except ValueError:
-            pass
-        if token == '0':
-            return 0.0
-        if token == '1':
-            return 1.0
-        if token.upper() == 'NULL': # Treat 'NULL' as a special keyword
-            return "NULL"
-        if token in self.variables:
-            return self.variables[token]
-        return token
+        value = _parse_literal(token)
+        if value is not None:
+            return value
+        return self.variables.get(token, token)
 
     def tokenize(self, line):
-        tokens = []
-        current = ""
-        in_quotes = False
-        escape = False
-
-        for char in line:
-            if escape:
-                current += char
-                escape = False
-            elif char == '\\':
-                escape = True
-            elif char == '"':
-                in_quotes = not in_quotes
-                current += char
-            elif char == ' ' and not in_quotes:
-                if current:
-                    tokens.append(current)
-                    current = ""
+        tokens = _TOKEN_RE.findall(line)
+        if '\\' in line: # Most lines have no escapes, skip the per-token pass
+            # Drop escape backslashes, keeping the escaped character itself
+            tokens = [_ESC_RE.sub(r'\1', token) if '\\' in token else token for token in tokens]
+        # Intern names so command and variable dict lookups can match by identity
+        return [sys.intern(token) if token.isidentifier() else token for token in tokens]
+
+    # --- Argument parsers: (self, raw_args, arg_count) -> list of handler args ---
+    def _parse_print_args(self, raw_args, arg_count):
+        parsed_args = [self.parse_value(raw_args[0])]
+        if len(raw_args) > 1:
+            if int(parsed_args[0]) == 0:
+                parsed_args.append(raw_args[1]) # Pass variable NAME for flag 0
             else:
-                current += char
-
-        if current:
-            tokens.append(current)
-        return tokens
-
-    def execute_line(self, line):
+                parsed_args.append(' '.join(raw_args[1:])) # Pass raw text for flag 1
+        else:
+            print(f"Warning: PRINT command with flag {raw_args[0]} has no content.")
+            parsed_args.append("")
+        return parsed_args
+
+    def _parse_if_args(self, raw_args, arg_count):
+        parsed_args = [self.parse_value(raw_args[i]) for i in range(arg_count - 1)]
+        parsed_args.append(' '.join(raw_args[arg_count-1:]))
+        return parsed_args
+
+    def _parse_joined_args(self, raw_args, arg_count):
+        # PYTHON and ET (CD) take the rest of the line as a single argument
+        return [' '.join(raw_args)]
+
+    def _parse_input_args(self, raw_args, arg_count):
+        return [raw_args[0]] # Pass raw variable name for input
+
+    def _parse_ls_args(self, raw_args, arg_count): # Handling for LI (LS)
+        parsed_args = [self.parse_value(raw_args[0])]
+        if len(raw_args) > 1:
+            parsed_args.append(' '.join(raw_args[1:]))
+        else:
+            parsed_args.append('')
+        return parsed_args
+
+    def _parse_fetch_args(self, raw_args, arg_count): # Network Command: SPECIAL HANDLING FOR VAR NAMES and NEW DECODE TYPE
+        parsed_args = [
+            self.parse_value(raw_args[0]), # Arg 0: URL (VAR,TXT) -> value
+            raw_args[1],                   # Arg 1: RAW_RESPONSE_VAR (VAR) -> name (pass raw token)
+            self.parse_value(raw_args[2]), # Arg 2: CLIENT_AGENT_VALUE (VAR,TXT) -> value
+            self.parse_value(raw_args[3]), # Arg 3: FORMAT_TYPE (VAR,TXT) -> value
+            self.parse_value(raw_args[4]), # NEW ARGUMENT: Arg 4: LANGUAGE_VAL (VAR,TXT) -> value
+            self.parse_value(raw_args[5]), # Arg 5 (shifted): DECODE_TYPE (TXT) -> value (e.g., "HTML", "TEXT", "RAW", "NONE")
+            raw_args[6],                   # Arg 6 (shifted): DECODED_OUTPUT_VAR (VAR) -> name (pass raw token)
+        ]
+        # Pad with NULLs if arguments are missing, though arg_count check should handle this
+        while len(parsed_args) < arg_count:
+            parsed_args.append("NULL")
+        return parsed_args
+
+    def _parse_generic_args(self, raw_args, arg_count): # Generic parsing for commands without a dedicated parser
+        return [self.parse_value(token) for token in raw_args]
+
+    _ARG_PARSERS = {
+        "PRINT": _parse_print_args,
+        "IF": _parse_if_args,
+        "PYTHON": _parse_joined_args,
+        "INPUT": _parse_input_args,
+        "ET": _parse_joined_args,
+        "LI": _parse_ls_args,
+        "FCH": _parse_fetch_args,
+        "FETCH": _parse_fetch_args,
+    }
+
+    def _compile_line(self, line):
+        """
+        Does all the parsing of a line that does not depend on variable values.
+        Returns None for a line with nothing to run, otherwise a (fn, args) pair;
+        executing the line is fn(*args). Diagnostics compile to a print call so
+        they still show up every time the line runs.
+        """
         line = line.strip()
         if not line:
-            return
+            return None
 
         # Corrected variable declaration parsing
         if line.startswith('<') and line.endswith('>'):
             # Remove any comments before processing the declaration
             clean_line = line.split('#', 1)[0].strip()
             if not clean_line.endswith('>'): # Ensure the > is still there after comment removal
-                print(f"Invalid variable declaration format: {line} (missing closing '>')")
-                return
+                return (print, (f"Invalid variable declaration format: {line} (missing closing '>')",))
 
             decl = clean_line[1:-1].split('=', 1)
             if len(decl) == 2:
                 var, val = decl
-                parsed_val = self.parse_value(val.strip())
-                self.variables[var.strip()] = parsed_val
-                return
+                return (self._declare, (sys.intern(var.strip()), val.strip()))
             else:
-                print(f"Invalid variable declaration: {line}")
-                return
+                return (print, (f"Invalid variable declaration: {line}",))
 
         tokens = self.tokenize(line)
         if not tokens:
-            return
+            return None
+
+        cmd = tokens[0]
+        entry = self._cmd_table.get(cmd) # Mnemonics are usually already upper case
+        if entry is None:
+            cmd = cmd.upper()
+            entry = self._cmd_table.get(cmd)
+        if entry is None:
+            return (print, (f"Unknown command: {cmd}",))
+
+        handler, arg_count, parse_args = entry
+        if handler is None:
+            return (print, (f"No handler for command: {cmd}",))
 
-        cmd = tokens[0].upper()
         raw_args = tokens[1:]
+        if cmd == 'JUMP' and len(raw_args) == 1 and self.script_lines:
+            # Resolve a literal, in-range target once; anything else goes through handle_jump
+            target = _parse_literal(raw_args[0])
+            if type(target) is float and target.is_integer() and 1 <= target <= len(self.script_lines):
+                return (self._jump_to, (int(target) - 1,))
 
-        if cmd not in self.commands:
-            print(f"Unknown command: {cmd}")
-            return
+        return (self._dispatch, (cmd, handler, arg_count, parse_args, raw_args))
 
-        command_def = self.commands[cmd]
-        handler_name = command_def['handler']
-        arg_count = command_def['arg_count']
+    def _declare(self, var, token):
+        self.variables[var] = self.parse_value(token)
 
-        if not handler_name or handler_name not in self.handlers:
-            print(f"No handler for command: {cmd}")
-            return
+    def _jump_to(self, jump_to_index):
+        self.program_counter = jump_to_index
 
-        parsed_args = []
-        if cmd == "PRINT":
-            parsed_args.append(self.parse_value(raw_args[0]))
-            if len(raw_args) > 1:
-                content_to_parse = ' '.join(raw_args[1:])
-                if int(self.parse_value(raw_args[0])) == 0:
-                     parsed_args.append(raw_args[1]) # Pass variable NAME for flag 0
-                else:
-                    parsed_args.append(content_to_parse) # Pass raw text for flag 1
-            else:
-                print(f"Warning: PRINT command with flag {raw_args[0]} has no content.")
-                parsed_args.append("")
-        elif cmd == "IF":
-            for i in range(arg_count - 1):
-                parsed_args.append(self.parse_value(raw_args[i]))
-            parsed_args.append(' '.join(raw_args[arg_count-1:]))
-        elif cmd == "PYTHON":
-            parsed_args.append(' '.join(raw_args))
-        elif cmd == "INPUT":
-            parsed_args.append(raw_args[0]) # Pass raw variable name for input
-        elif cmd == "ET": # Handling for ET (CD)
-            parsed_args.append(' '.join(raw_args))
-        elif cmd == "LI": # Handling for LI (LS)
-            parsed_args.append(self.parse_value(raw_args[0]))
-            if len(raw_args) > 1:
-                parsed_args.append(' '.join(raw_args[1:]))
-            else:
-                parsed_args.append('')
-        elif cmd == "FCH" or cmd == "FETCH": # Network Command: SPECIAL HANDLING FOR VAR NAMES and NEW DECODE TYPE
-             # Arg 0: URL (VAR,TXT) -> value
-             parsed_args.append(self.parse_value(raw_args[0]))
-             # Arg 1: RAW_RESPONSE_VAR (VAR) -> name (pass raw token)
-             parsed_args.append(raw_args[1])
-             # Arg 2: CLIENT_AGENT_VALUE (VAR,TXT) -> value
-             parsed_args.append(self.parse_value(raw_args[2]))
-             # Arg 3: FORMAT_TYPE (VAR,TXT) -> value
-             parsed_args.append(self.parse_value(raw_args[3]))
-             # NEW ARGUMENT: Arg 4: LANGUAGE_VAL (VAR,TXT) -> value
-             parsed_args.append(self.parse_value(raw_args[4]))
-             # Arg 5 (shifted): DECODE_TYPE (TXT) -> value (e.g., "HTML", "TEXT", "RAW", "NONE")
-             parsed_args.append(self.parse_value(raw_args[5]))
-             # Arg 6 (shifted): DECODED_OUTPUT_VAR (VAR) -> name (pass raw token)
-             parsed_args.append(raw_args[6])
-             
-             # Pad with NULLs if arguments are missing, though arg_count check should handle this
-             while len(parsed_args) < arg_count:
-                 parsed_args.append("NULL") 
-
-        else: # Generic parsing for commands not explicitly handled above
-            for token in raw_args:
-                parsed_args.append(self.parse_value(token))
+    def _dispatch(self, cmd, handler, arg_count, parse_args, raw_args):
+        try:
+            # Arguments are parsed on every run since they may name variables
+            parsed_args = parse_args(self, raw_args, arg_count)
+        except (IndexError, ValueError, TypeError, OverflowError) as e: # Missing or malformed arguments
+            print(f"Argument error in {cmd}: {str(e)}. Check command definition and arguments.")
+            return
 
         try:
             # Ensure the number of arguments matches expected, or it's a TypeError
             if len(parsed_args) != arg_count:
                  print(f"Argument error in {cmd}: Expected {arg_count} arguments, but got {len(parsed_args)}.")
                  return
-            self.handlers[handler_name](*parsed_args) # Pass all parsed args
+            handler(*parsed_args) # Pass all parsed args
         except TypeError as e:
             print(f"Argument error in {cmd}: {str(e)}. Check command definition and arguments.")
         except Exception as e:
             print(f"Error executing {cmd}: {str(e)}")
 
+    def execute_line(self, line):
+        instruction = self._compile_line(line)
+        if instruction is not None:
+            fn, args = instruction
+            fn(*args)
+
     def handle_cmp(self, val1, val2, condition, branch, script):
-        try:
-            val1 = float(val1)
-            val2 = float(val2)
-        except (ValueError, TypeError):
+        val1 = _as_number(val1)
+        val2 = _as_number(val2)
+        if val1 is None or val2 is None:
             print("IF command requires numeric values")
             return
 
         condition = condition.upper()
         branch = branch.upper()
 
-        condition_met = False
-        if condition == 'HIGH' and val1 > val2:
-            condition_met = True
-        elif condition == 'LOW' and val1 < val2:
-            condition_met = True
-        elif condition == 'EQUAL' and val1 == val2:
-            condition_met = True
-        else:
+        cmp_op = _CMP_OPS.get(condition)
+        if cmp_op is None:
             print(f"Invalid condition: {condition}")
             return
+        condition_met = _compare(cmp_op, val1, val2)
 
         if (branch == 'THEN' and condition_met) or (branch == 'ELSE' and not condition_met):
-            self.execute_line(script)
-
-    def handle_logic_gate(self, in1, in2, out, gate_type):
-        try:
-            val1 = bool(float(in1))
-            val2 = bool(float(in2))
-        except (ValueError, TypeError):
+            # Compile each branch script once; 'IF ... THEN JUMP n' loops revisit it every iteration
+            instruction = self._branch_cache.get(script)
+            if instruction is None:
+                instruction = self._branch_cache[script] = self._compile_line(script)
+            if instruction is not None:
+                fn, args = instruction
+                fn(*args)
+
+    def handle_logic_gate(self, in1, in2, out, gate_op):
+        val1 = _as_number(in1)
+        val2 = _as_number(in2)
+        if val1 is None or val2 is None:
             print("Logic gates require numeric values (0 or 1)")
             return
 
-        if gate_type == "AND":
-            result = val1 and val2
-        elif gate_type == "OR":
-            result = val1 or val2
-        elif gate_type == "NOR":
-            result = not (val1 or val2)
-        elif gate_type == "XNOR":
-            result = val1 == val2
-        elif gate_type == "XOR":
-            result = val1 != val2
-        else:
-            print(f"Unknown gate type: {gate_type}")
-            return
-
-        self.variables[out] = float(int(result))
+        self.variables[out] = _dispatch_binop(gate_op, val1, val2)
 
     def handle_logic_and(self, in1, in2, out):
-        self.handle_logic_gate(in1, in2, out, "AND")
+        self.handle_logic_gate(in1, in2, out, _OP_AND)
 
     def handle_logic_or(self, in1, in2, out):
-        self.handle_logic_gate(in1, in2, out, "OR")
+        self.handle_logic_gate(in1, in2, out, _OP_OR)
 
     def handle_logic_nor(self, in1, in2, out):
-        self.handle_logic_gate(in1, in2, out, "NOR")
+        self.handle_logic_gate(in1, in2, out, _OP_NOR)
 
     def handle_logic_xnor(self, in1, in2, out):
-        self.handle_logic_gate(in1, in2, out, "XNOR")
+        self.handle_logic_gate(in1, in2, out, _OP_XNOR)
 
     def handle_logic_xor(self, in1, in2, out):
-        self.handle_logic_gate(in1, in2, out, "XOR")
+        self.handle_logic_gate(in1, in2, out, _OP_XOR)
 
     def handle_arith(self, a, b, out, op):
-        try:
-            a_val = float(a)
-            b_val = float(b)
-        except (ValueError, TypeError):
+        a_val = _as_number(a)
+        b_val = _as_number(b)
+        if a_val is None or b_val is None:
             print("Arithmetic operations require numeric values")
             return
-
-        if op == "ADD":
-            result = a_val + b_val
-        elif op == "SUB":
-            result = a_val - b_val
-        elif op == "MULT":
-            result = a_val * b_val
-        elif op == "DIV":
-            if b_val == 0.0:
-                print("Division by zero")
-                return
-            result = a_val / b_val
-        else:
-            print(f"Unknown operation: {op}")
+        if op == _OP_DIV and b_val == 0.0:
+            print("Division by zero")
             return
 
-        self.variables[out] = result
+        self.variables[out] = _dispatch_binop(op, a_val, b_val)
 
     def handle_arith_add(self, a, b, out):
-        self.handle_arith(a, b, out, "ADD")
+        self.handle_arith(a, b, out, _OP_ADD)
 
     def handle_arith_sub(self, a, b, out):
-        self.handle_arith(a, b, out, "SUB")
+        self.handle_arith(a, b, out, _OP_SUB)
 
     def handle_arith_mult(self, a, b, out):
-        self.handle_arith(a, b, out, "MULT")
+        self.handle_arith(a, b, out, _OP_MULT)
 
     def handle_arith_div(self, a, b, out):
-        self.handle_arith(a, b, out, "DIV")
+        self.handle_arith(a, b, out, _OP_DIV)
 
     def handle_print(self, flag, content_raw):
         """Handle print command"""
@@ -401,35 +558,21 @@ class SPiDInterpreter:
 
 
     def handle_bool_set(self, value, var):
-        try:
-            val = float(value)
-            if val == 0.0 or val == 1.0:
-                self.variables[var] = val
-            else:
-                print(f"Invalid BOOL value: {value}. Must be 0 or 1 (or 0.0 or 1.0).")
-        except ValueError:
+        val = _as_number(value)
+        if val == 0.0 or val == 1.0:
+            self.variables[var] = val
+        else:
             print(f"Invalid BOOL value: {value}. Must be 0 or 1 (or 0.0 or 1.0).")
 
     def handle_python(self, code):
         try:
             if code.startswith('"') and code.endswith('"'):
                 code = code[1:-1]
-            env = {
-                'variables': self.variables,
-                'ram': self.ram,
-                'print': print,
-                'int': int,
-                'float': float,
-                'str': str,
-                'bool': bool,
-                'len': len,
-                'range': range,
-                # Add network libraries if available
-                'requests': requests,
-                'BeautifulSoup': BeautifulSoup,
-                'html2text': html2text, # NEW: Make html2text available in PYTHON env
-            }
-            exec(code, env)
+            env = self._py_env
+            # Re-bind in case an earlier snippet assigned over these names
+            env['variables'] = self.variables
+            env['ram'] = self.ram
+            exec(_compile_python(code), env)
         except Exception as e:
             print(f"Python execution error: {e}")
 
@@ -465,7 +608,6 @@ class SPiDInterpreter:
     def handle_cd(self, directory_path):
         """Changes the current working directory."""
         try:
-            import os
             if directory_path.startswith('"') and directory_path.endswith('"'):
                 directory_path = directory_path[1:-1]
             os.chdir(directory_path)
@@ -480,7 +622,6 @@ class SPiDInterpreter:
     def handle_ls(self, flag, directory_path=''):
         """Lists directory contents."""
         try:
-            import os
             flag_int = int(flag) # Ensure flag is interpreted as integer
             if directory_path.startswith('"') and directory_path.endswith('"'):
                 directory_path = directory_path[1:-1]
@@ -491,80 +632,109 @@ class SPiDInterpreter:
                 print(f"Error: Directory '{target_dir}' not found.")
                 return
 
-            contents = os.listdir(target_dir)
-            
-            for item in sorted(contents):
-                if flag_int == 1 or not item.startswith('.'): # List hidden if flag is 1
-                    full_path = os.path.join(target_dir, item)
-                    if os.path.isdir(full_path):
-                        print(f"D {item}")
-                    elif os.path.isfile(full_path):
-                        print(f"F {item}")
+            # scandir entries carry the file type from the directory listing, so
+            # is_dir()/is_file() usually need no extra stat call per entry
+            with os.scandir(target_dir) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+
+            for entry in entries:
+                if flag_int == 1 or not entry.name.startswith('.'): # List hidden if flag is 1
+                    if entry.is_dir():
+                        print(f"D {entry.name}")
+                    elif entry.is_file():
+                        print(f"F {entry.name}")
                     else:
-                        print(f"? {item}")
+                        print(f"? {entry.name}")
         except ValueError:
             print(f"LI error: Invalid flag '{flag}'. Use 0 or 1.")
         except Exception as e:
             print(f"LI error: {e}")
 
     # --- Network Commands ---
-    def handle_network_fetch(self, url, raw_response_var, client_agent_val, format_val, language_val, decode_type_val, decoded_output_var):
+    def _prepare_fetch(self, client_agent_val, format_val, language_val, decode_type_val):
         """
-        Handles the FCH/FETCH command for network requests with integrated decoding.
-        url: The URL to fetch (string).
-        raw_response_var: Variable name to store the raw response text.
-        client_agent_val: User-Agent header value (string or "TCHOA").
-        format_val: Expected content format (e.g., "HTML", "JSON", or "NULL").
-        language_val: Language to request (e.g., "en-US", "ar-LB", or "NULL").
-        decode_type_val: "HTML" for BeautifulSoup prettify, "TEXT" for html2text, "RAW"/"NONE"/"NULL" for raw copy.
-        decoded_output_var: Variable name to store the decoded/prettified content.
+        Builds the request headers for FCH/FETCH.
+        Returns (headers, notes, format_is_html, decode_type_upper); notes are the
+        status messages to print for every fetch made with these settings.
         """
-        if requests is None:
-            print("NETWORK_FETCH error: 'requests' library is not installed. Cannot perform network operations.")
-            self.variables[raw_response_var] = "ERROR: requests lib missing"
-            if decoded_output_var != "NULL": 
-                self.variables[decoded_output_var] = "ERROR: requests lib missing"
-            return
-
         headers = {}
-        processed_url = str(url)
+        notes = []
 
         # Client-Agent Header Logic
         if client_agent_val != "NULL":
             if str(client_agent_val).upper() == "TCHOA":
                 headers['User-Agent'] = "TechOS-Client/1.1 HotRevamp SPiD-Engine/1.0 (+https://github.com/BryOfficial82/TechOS/blob/main/Main-Parser-1.0.py)" # Example custom header
-                print("Client-Agent: TechOS custom header assigned.")
+                notes.append("Client-Agent: TechOS custom header assigned.")
             else:
                 headers['User-Agent'] = str(client_agent_val)
-                print(f"Client-Agent: Custom header '{client_agent_val}' assigned.")
+                notes.append(f"Client-Agent: Custom header '{client_agent_val}' assigned.")
         else:
-            print("Client-Agent: Default header will be used.")
+            notes.append("Client-Agent: Default header will be used.")
 
         # Format Header Logic (Accept header)
+        format_val_upper = str(format_val).upper()
         if format_val != "NULL":
-            format_val_upper = str(format_val).upper()
             if format_val_upper == "HTML":
                 headers['Accept'] = 'text/html, application/xhtml+xml, application/xml;q=0.9, */*;q=0.8'
-                print("Format: Requesting HTML content.")
+                notes.append("Format: Requesting HTML content.")
             elif format_val_upper == "JSON":
                 headers['Accept'] = 'application/json'
-                print("Format: Requesting JSON content.")
+                notes.append("Format: Requesting JSON content.")
             else:
                 headers['Accept'] = str(format_val)
-                print(f"Format: Requesting custom content type '{format_val}'.")
+                notes.append(f"Format: Requesting custom content type '{format_val}'.")
         else:
-            print("Format: No specific format requested.")
+            notes.append("Format: No specific format requested.")
 
         # NEW: Language Header Logic (Accept-Language)
         if language_val != "NULL":
             headers['Accept-Language'] = str(language_val)
-            print(f"Language: Requesting content in '{language_val}'.")
+            notes.append(f"Language: Requesting content in '{language_val}'.")
         else:
-            print("Language: No specific language requested.")
+            notes.append("Language: No specific language requested.")
+
+        decode_type_upper = str(decode_type_val).upper() # Normalize for comparison
+        return headers, tuple(notes), format_val_upper == "HTML", decode_type_upper
+
+    def handle_network_fetch(self, url, raw_response_var, client_agent_val, format_val, language_val, decode_type_val, decoded_output_var):
+        """
+        Handles the FCH/FETCH command for network requests with integrated decoding.
+        url: The URL to fetch (string).
+        raw_response_var: Variable name to store the raw response text.
+        client_agent_val: User-Agent header value (string or "TCHOA").
+        format_val: Expected content format (e.g., "HTML", "JSON", or "NULL").
+        language_val: Language to request (e.g., "en-US", "ar-LB", or "NULL").
+        decode_type_val: "HTML" for BeautifulSoup prettify, "TEXT" for html2text, "RAW"/"NONE"/"NULL" for raw copy.
+        decoded_output_var: Variable name to store the decoded/prettified content.
+        """
+        if requests is None:
+            print("NETWORK_FETCH error: 'requests' library is not installed. Cannot perform network operations.")
+            self.variables[raw_response_var] = "ERROR: requests lib missing"
+            if decoded_output_var != "NULL": 
+                self.variables[decoded_output_var] = "ERROR: requests lib missing"
+            return
+
+        processed_url = str(url)
+
+        # Header construction only depends on these arguments, so build it once per combination.
+        # Types are part of the key because True, 1 and 1.0 hash equal but print differently.
+        fetch_args = (client_agent_val, format_val, language_val, decode_type_val)
+        fetch_key = tuple((type(value), value) for value in fetch_args)
+        try:
+            prepared = self._fetch_cache.get(fetch_key)
+        except TypeError: # Unhashable value, e.g. a list set by a PYTHON snippet
+            fetch_key = prepared = None
+        if prepared is None:
+            prepared = self._prepare_fetch(*fetch_args)
+            if fetch_key is not None:
+                self._fetch_cache[fetch_key] = prepared
+        headers, notes, format_is_html, decode_type_upper = prepared
+        for note in notes:
+            print(note)
 
         try:
             print(f"Fetching from: {processed_url}")
-            response = requests.get(processed_url, headers=headers, timeout=10)
+            response = self._session.get(processed_url, headers=headers, timeout=10)
             response.raise_for_status()
 
             self.variables[raw_response_var] = str(response.text) 
@@ -572,7 +742,6 @@ class SPiDInterpreter:
 
             # Handle post-processing based on decode_type_val
             processed_content = None # To hold the result of decoding
-            decode_type_upper = str(decode_type_val).upper() # Normalize for comparison
 
             if decoded_output_var == "NULL":
                 print("Decoding skipped: No variable provided for decoded content.")
@@ -580,10 +749,9 @@ class SPiDInterpreter:
                 if BeautifulSoup is None:
                     print("NETWORK_FETCH warning: BeautifulSoup4 library not found. HTML prettification skipped.")
                     self.variables[decoded_output_var] = "Error: BeautifulSoup4 not available."
-                elif str(format_val).upper() == "HTML": # BeautifulSoup expects HTML input
+                elif format_is_html: # BeautifulSoup expects HTML input
                     try:
-                        soup = BeautifulSoup(self.variables[raw_response_var], 'html.parser')
-                        processed_content = str(soup.prettify())
+                        processed_content = _html_prettify(self.variables[raw_response_var])
                         print(f"HTML prettified content stored in '{decoded_output_var}'.")
                     except Exception as parse_e:
                         self.variables[decoded_output_var] = f"Error during HTML parsing: {parse_e}"
@@ -595,15 +763,9 @@ class SPiDInterpreter:
                 if html2text is None:
                     print("NETWORK_FETCH warning: 'html2text' library not found. Text decoding skipped.")
                     self.variables[decoded_output_var] = "Error: html2text not available."
-                elif str(format_val).upper() == "HTML": # html2text expects HTML input
+                elif format_is_html: # html2text expects HTML input
                     try:
-                        h = html2text.HTML2Text()
-                        # Configure html2text for clean terminal output by default
-                        h.ignore_links = True
-                        h.ignore_images = True
-                        h.ignore_tables = True
-                        h.body_width = 80 # Optional: wrap lines for better readability
-                        processed_content = h.handle(self.variables[raw_response_var])
+                        processed_content = _html_to_text(self.variables[raw_response_var])
                         print(f"HTML converted to text content stored in '{decoded_output_var}'.")
                     except Exception as text_e:
                         self.variables[decoded_output_var] = f"Error during text conversion: {text_e}"
@@ -642,36 +804,53 @@ class SPiDInterpreter:
 
     def run(self):
         if self.script_lines:
+            # Keep the hot loop's lookups in locals; JUMP still moves
+            # self.program_counter, so it is re-read after every line
+            lines = self.script_lines
+            line_count = len(lines)
+            program = self._program
+            verbose = self.verbose
             self.program_counter = 0
-            while self.program_counter < len(self.script_lines):
-                original_program_counter = self.program_counter
-
-                line = self.script_lines[self.program_counter]
-                print(f"[{self.program_counter + 1}] SPiD> {line}")
-                self.execute_line(line)
-
-                if self.program_counter == original_program_counter:
-                    self.program_counter += 1
+            while self.program_counter < line_count:
+                pc = self.program_counter
+
+                if verbose:
+                    print(f"[{pc + 1}] SPiD> {lines[pc]}")
+                instruction = program[pc]
+                if instruction is not None:
+                    fn, args = instruction
+                    fn(*args)
+
+                if self.program_counter == pc:
+                    self.program_counter = pc + 1
         else:
             print("[ FATAL ] All methods failed, fallbacking to shell.")
             print("SPiD OS - Type 'exit' to quit")
+            execute_line = self.execute_line
             while True:
                 try:
                     line = input("SPiD> ")
-                    if line.lower() == 'whoami':
+                    shell_cmd = line.lower()
+                    if shell_cmd == 'whoami':
                         print("--System Main SPiD--")
-                    elif line.lower() == 'run':
+                    elif shell_cmd == 'run':
                         print("[     W.I.P     ] Run is not implemented yet, try running your code directly on boot.")
-                    elif line.lower() == 'exit':
+                    elif shell_cmd == 'exit':
                         break
                     else:
-                        self.execute_line(line)
+                        execute_line(line)
                 except KeyboardInterrupt:
                     print("\nExiting...")
                     break
                 except Exception as e:
                     print(f"Error: {e}")
 
+
+# Grammar is static, so parse it once. Done after the class body because a bare
+# staticmethod object is only callable there from Python 3.10 on.
+SPiDInterpreter._COMMANDS = SPiDInterpreter.parse_SPiD_definition()
+
+
 # --- Main execution logic with hardcoded script override ---
 if __name__ == "__main__":
     hardcoded_script = """
@@ -686,31 +865,34 @@ PRINT 0 CLEAN_TEXT
 # PRINT 1 "--- Raw Page Content (for debugging) ---"
 # PRINT 0 RAW_PAGE
 """
+    # -v / --verbose echoes each script line before running it
+    cli_args = [arg for arg in sys.argv[1:] if arg not in ('-v', '--verbose')]
+    verbose = len(cli_args) < len(sys.argv) - 1
+
     script_file_path = None
-    if len(sys.argv) > 1:
-        script_file_path = sys.argv[1]
+    if cli_args:
+        script_file_path = cli_args[0]
+
+    # Split the fallback script once; every fallback path below reuses it
+    FALLBACK_LINES = list(_script_lines(hardcoded_script.splitlines()))
+
+    def _run_fallback(msg=None):
+        """Runs the hardcoded script, after printing why if a reason is given."""
+        if msg:
+            print(msg)
+        interpreter = SPiDInterpreter(script_lines=FALLBACK_LINES, verbose=verbose)
+        print("SPiD OS - Running hardcoded fallback script.")
+        interpreter.run()
 
     if script_file_path:
         try:
-            with open(script_file_path, 'r') as f:
-                script_lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
-            interpreter = SPiDInterpreter(script_lines=script_lines)
-            print(f"SPiD OS - Running script from file: {script_file_path}")
-            interpreter.run()
+            interpreter = SPiDInterpreter.from_path(script_file_path, verbose=verbose)
         except FileNotFoundError:
-            print(f"Error: File '{script_file_path}' not found. Attempting hardcoded script as fallback.")
-            fallback_script_lines = [line.strip() for line in hardcoded_script.strip().split('\n') if line.strip() and not line.strip().startswith('#')]
-            interpreter = SPiDInterpreter(script_lines=fallback_script_lines)
-            print("SPiD OS - Running hardcoded fallback script.")
-            interpreter.run()
-        except Exception as e:
-            print(f"Error loading script from file: {e}. Attempting hardcoded script as fallback.")
-            fallback_script_lines = [line.strip() for line in hardcoded_script.strip().split('\n') if line.strip() and not line.strip().startswith('#')]
-            interpreter = SPiDInterpreter(script_lines=fallback_script_lines)
-            print("SPiD OS - Running hardcoded fallback script.")
+            _run_fallback(f"Error: File '{script_file_path}' not found. Attempting hardcoded script as fallback.")
+        except (OSError, UnicodeDecodeError) as e: # e.g. permission denied, a directory, not text
+            _run_fallback(f"Error loading script from file: {e}. Attempting hardcoded script as fallback.")
+        else:
+            print(f"SPiD OS - Running script from file: {script_file_path}")
             interpreter.run()
     else:
-        print("SPiD OS - No script file specified. Running hardcoded default script.")
-        fallback_script_lines = [line.strip() for line in hardcoded_script.strip().split('\n') if line.strip() and not line.strip().startswith('#')]
-        interpreter = SPiDInterpreter(script_lines=fallback_script_lines)
-        interpreter.run()
\ No newline at end of file
+        _run_fallback("SPiD OS - No script file specified.")
\ No newline at end of file